@@ -14,12 +14,47 @@ Funcionalidades:
 6. Operação automática completa
 """
 
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
+from itertools import chain
 from psycopg2 import sql
+from io import StringIO, BytesIO
+import pyarrow as pa
 import pandas as pd
 import psycopg2
 import os
+import re
+
+try:
+    # Dependência opcional (fora do requirements.txt), usada apenas no
+    # método de carga 'binary': pip install pgpq
+    import pgpq
+except ImportError:
+    pgpq = None
+
+# Caracteres trocados por underline na normalização dos nomes de colunas
+COLUMN_SEPARATORS = re.compile(r'[ \-.]')
+
+# Mapeamento do código de tipo do pandas (dtype.kind) para tipos SQL genéricos
+DTYPE_KIND_TO_SQL = {
+    'i': 'INTEGER',     # Inteiros com sinal (int8, int16, int32, int64)
+    'u': 'INTEGER',     # Inteiros sem sinal
+    'f': 'REAL',        # Ponto flutuante de precisão simples
+    'b': 'BOOLEAN',     # Booleano
+    'M': 'TIMESTAMP'    # Datetime (qualquer variação)
+}
+
+# Tipo PyArrow correspondente a cada tipo SQL, usado no COPY binário
+# (o formato binário exige que cada valor tenha exatamente o tipo da coluna)
+SQL_TO_ARROW_TYPE = {
+    'INTEGER': pa.int32(),
+    'REAL': pa.float32(),
+    'DOUBLE PRECISION': pa.float64(),
+    'BOOLEAN': pa.bool_(),
+    'TIMESTAMP': pa.timestamp('us'),
+    'DATE': pa.date32(),
+    'TEXT': pa.string()
+}
 
 
 class PostgreSQLImporter:
@@ -41,19 +76,47 @@ class PostgreSQLImporter:
         self.port = port
         self.connection = None  # Objeto de conexão será criado posteriormente
         
+    def new_connection(self, database = 'postgres'):
+        """
+        Abre uma nova conexão independente com o banco informado.
+        
+        Usado pela conexão principal e pela conexão temporária de create_database.
+        """
+        # Cria conexão usando psycopg2 com parâmetros fornecidos
+        # Keepalives evitam que a conexão ociosa seja derrubada por NAT/firewall
+        return psycopg2.connect(
+            host = self.host,
+            user = self.user,
+            password = self.password,
+            port = self.port,
+            database = database,
+            keepalives = 1,
+            keepalives_idle = 30
+        )
+    
+    def is_connected(self, database = None):
+        """
+        Verifica se há conexão aberta (opcionalmente, com o banco informado).
+        """
+        if self.connection is None or self.connection.closed:
+            return False
+        return database is None or self.connection.info.dbname == database
+    
     def create_connection(self, database = 'postgres'):
         """
         Estabelece conexão com o banco de dados PostgreSQL.
+        
+        Se já houver uma conexão aberta com o mesmo banco, ela é reaproveitada.
         """
+        # Reaproveita a conexão existente, evitando um novo handshake
+        if self.is_connected(database):
+            return True
+        
         try:
-            # Cria conexão usando psycopg2 com parâmetros fornecidos
-            self.connection = psycopg2.connect(
-                host = self.host,
-                user = self.user,
-                password = self.password,
-                port = self.port,
-                database = database
-            )
+            # Fecha conexão com outro banco antes de abrir a nova
+            self.close_connection()
+            
+            self.connection = self.new_connection(database)
             print(f"Conexão com '{database}' estabelecida com sucesso.")
             return True
         except psycopg2.Error as e:
@@ -65,28 +128,34 @@ class PostgreSQLImporter:
             print(f"Erro inesperado ao conectar: {e}")
             return False
     
+    def close_connection(self):
+        """
+        Fecha a conexão principal, se estiver aberta.
+        """
+        if self.is_connected():
+            self.connection.close()
+    
     def create_database(self, db_name):
         """
         Cria um novo banco de dados se ele não existir.
         
         Para criar um banco de dados, é necessário conectar ao banco,
-        pois não é possível criar banco dentro de si mesmo.
+        pois não é possível criar banco dentro de si mesmo. Se a conexão
+        principal já estiver no banco 'postgres', ela é reaproveitada;
+        caso contrário, uma conexão temporária é aberta só para esta etapa.
         """
 
+        connection = None
+        reuse = self.is_connected('postgres')
         try:
-            # Fecha conexão atual se estiver conectado a outro banco
-            if (self.connection and 
-                self.connection.get_dsn_parameters()['dbname'] != 'postgres'):
-                self.connection.close()
-            
-            # Conecta ao banco 'postgres' (banco padrão do sistema)
-            self.create_connection('postgres')
+            # Usa a conexão ao banco 'postgres' (banco padrão do sistema)
+            connection = self.connection if reuse else self.new_connection('postgres')
             
-            # Define nível de isolamento para AUTOCOMMIT (necessário para CREATE DATABASE)
-            self.connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            # Ativa AUTOCOMMIT (necessário para CREATE DATABASE)
+            connection.autocommit = True
             
             # Cria cursor para executar comandos SQL
-            cursor = self.connection.cursor()
+            cursor = connection.cursor()
             
             # Verifica se o banco já existe consultando o catálogo do PostgreSQL
             cursor.execute(
@@ -106,9 +175,8 @@ class PostgreSQLImporter:
             else:
                 print(f"Banco de dados '{db_name}' já existe.")
             
-            # Fecha cursor e conexão
+            # Fecha cursor
             cursor.close()
-            self.connection.close()
             return True
             
         except psycopg2.Error as e:
@@ -117,6 +185,14 @@ class PostgreSQLImporter:
         except Exception as e:
             print(f"Erro inesperado ao criar banco de dados: {e}")
             return False
+        finally:
+            if connection is not None:
+                if reuse:
+                    # Restaura o modo transacional da conexão principal
+                    connection.autocommit = False
+                else:
+                    # Fecha a conexão temporária
+                    connection.close()
     
     @staticmethod
     def pandas_to_sql_type(dtype):
@@ -126,25 +202,9 @@ class PostgreSQLImporter:
         Este método estático fornece mapeamento padrão para quando não há
         um mapeamento específico definido para a coluna.
         """
-        # Verifica tipo inteiro (inclui int8, int16, int32, int64)
-        if pd.api.types.is_integer_dtype(dtype):
-            return 'INTEGER'
-        
-        # Verifica tipo float (inclui float16, float32, float64)
-        elif pd.api.types.is_float_dtype(dtype):
-            return 'REAL'  # Ponto flutuante de precisão simples
-        
-        # Verifica tipo booleano
-        elif pd.api.types.is_bool_dtype(dtype):
-            return 'BOOLEAN'
-        
-        # Verifica tipo datetime (qualquer variação)
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return 'TIMESTAMP'
-        
-        # Para todos os outros casos (strings, objetos, etc.)
-        else:
-            return 'TEXT'
+        # Consulta direta pelo código do tipo (dtype.kind), válido para dtypes
+        # numpy e PyArrow; demais casos (strings, objetos, etc.) viram TEXT
+        return DTYPE_KIND_TO_SQL.get(getattr(dtype, 'kind', 'O'), 'TEXT')
     
     def get_column_type_for_your_table(self, column_name, dtype):
         """
@@ -160,7 +220,7 @@ class PostgreSQLImporter:
         
         # Mapeamento específico para as colunas do dataset IDA
         type_mapping = {
-            'id': 'INTEGER PRIMARY KEY',        # Chave primária
+            'id': 'INTEGER',                    # Chave primária (criada após a carga)
             'grupo_economico': 'TEXT',          # Texto livre
             'servico': 'TEXT',                  # Texto livre
             'mes_referencia': 'DATE',           # Data (apenas data, sem hora)
@@ -190,120 +250,390 @@ class PostgreSQLImporter:
                 errors='coerce' # converte valores inválidos para NaT
             )
         
-        # Processa coluna de valor (já tratada no código anterior)
-        if 'valor' in df.columns:
-            # Converte strings vazias para None (NULL no SQL)
-            df['valor'] = df['valor'].replace('', None)
-        
         # Normaliza nomes das colunas para padrão SQL
-        df.columns = [
-            col.replace(' ', '_')   # Espaços para underline
-               .replace('-', '_')   # Hífens para underline
-               .replace('.', '_')   # Pontos para underline
-               .lower()             # Tudo minúsculo
+        # (espaços, hífens e pontos viram underline; tudo minúsculo)
+        df.columns = df.columns.str.replace(COLUMN_SEPARATORS, '_', regex = True).str.lower()
+        
+        return df
+    
+    @staticmethod
+    def column_converter(dtype):
+        """
+        Escolhe, uma única vez por coluna, a conversão para tipos Python nativos.
+        
+        Retorna uma função que recebe a coluna inteira e devolve uma lista
+        de objetos Python, com None no lugar dos valores nulos.
+        """
+        if dtype == object:
+            # Colunas de objetos podem misturar tipos: nulos do pandas -> None
+            return lambda serie: serie.astype(object).where(serie.notna(), None).tolist()
+        
+        # Demais tipos (numpy ou PyArrow): o PyArrow gera a lista em C,
+        # já com tipos Python (int, float, datetime...) e None nos nulos
+        return lambda serie: pa.array(serie).to_pylist()
+    
+    def dataframe_to_records(self, df, page_size = 10_000):
+        """
+        Converte o DataFrame em tuplas com tipos Python nativos.
+        
+        A conversão de cada coluna é escolhida uma vez, por seu dtype, e
+        aplicada a fatias de `page_size` linhas; as tuplas de cada fatia são
+        montadas com zip sobre as listas, sem inspecionar tipos célula a
+        célula. Só as listas de uma fatia ficam em memória por vez.
+        """
+        converters = [self.column_converter(dtype) for dtype in df.dtypes]
+        
+        for start in range(0, len(df), page_size):
+            page = df.iloc[start:start + page_size]
+            columns = [
+                converter(page.iloc[:, i])
+                for i, converter in enumerate(converters)
+            ]
+            yield from zip(*columns)
+    
+    @staticmethod
+    def configure_bulk_load(cursor):
+        """
+        Ajusta a transação atual para carga em massa.
+        
+        Desliga a espera pelo flush do WAL no commit e aumenta a memória
+        usada na criação de índices. SET LOCAL vale só até o fim da transação.
+        """
+        cursor.execute("SET LOCAL synchronous_commit = OFF;")
+        cursor.execute("SET LOCAL maintenance_work_mem = '1GB';")
+    
+    def get_columns_schema(self, df):
+        """
+        Deriva o schema da tabela (lista de pares coluna, tipo SQL) do DataFrame.
+        """
+        # Determina tipo SQL apropriado para cada coluna
+        return [
+            (col, self.get_column_type_for_your_table(col, df[col].dtype))
             for col in df.columns
         ]
+    
+    @staticmethod
+    def get_existing_table_schema(cursor, table_name):
+        """
+        Consulta o schema de uma tabela existente no information_schema.
         
-        return df
+        Retorna a lista de pares (coluna, tipo SQL) na ordem das colunas,
+        ou uma lista vazia se a tabela não existir.
+        """
+        cursor.execute(
+            sql.SQL("""
+                SELECT column_name, data_type
+                FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+                ORDER BY ordinal_position
+            """),
+            [table_name]
+        )
+        return cursor.fetchall()
+    
+    @staticmethod
+    def schemas_match(expected, existing):
+        """
+        Compara o schema derivado do CSV com o schema da tabela existente.
+        """
+        # O information_schema usa o nome completo de alguns tipos
+        aliases = {'timestamp': 'timestamp without time zone'}
+        
+        expected = [(col, aliases.get(sql_type.lower(), sql_type.lower()))
+                    for col, sql_type in expected]
+        return expected == [(col, data_type.lower()) for col, data_type in existing]
+    
+    def create_table(self, cursor, df, table_name):
+        """
+        Recria a tabela com o schema derivado das colunas do DataFrame.
+        """
+        # Prepara definição de colunas para CREATE TABLE
+        # (nomes como identificadores; tipos vêm do mapeamento interno)
+        columns_def = [
+            sql.SQL("{} {}").format(sql.Identifier(col), sql.SQL(sql_type))
+            for col, sql_type in self.get_columns_schema(df)
+        ]
+        
+        # REMOVER TABELA EXISTENTE SE HOUVER (EVITA DUPLICATAS)
+        print(f"Verificando tabela existente: {table_name}")
+        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(table_name)))
+        print(f"Tabela '{table_name}' limpa (se existia)")
+        
+        # Query CREATE TABLE
+        create_table_query = sql.SQL("CREATE TABLE {} ({});").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(columns_def)
+        )
+        
+        # Executa criação da tabela
+        cursor.execute(create_table_query)
+        print(f"Tabela '{table_name}' criada com sucesso.")
+    
+    def copy_dataframe(self, cursor, df, table_name, buffer = None):
+        """
+        Insere os dados do DataFrame na tabela via COPY FROM STDIN.
+        
+        O COPY envia todas as linhas em um único fluxo, sem o custo
+        de parse/planejamento de um INSERT por linha. Um `buffer` pode
+        ser informado para ser reaproveitado entre chamadas.
+        """
+        # Serializa os dados em memória no formato CSV
+        # Valores nulos são escritos como \N, marcador de NULL do COPY
+        if buffer is None:
+            buffer = StringIO()
+        buffer.seek(0)
+        buffer.truncate()
+        df.to_csv(buffer, index = False, header = False, na_rep = '\\N')
+        buffer.seek(0)
+        
+        copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, df.columns))
+        )
+        cursor.copy_expert(copy_query, buffer)
+    
+    def dataframe_to_arrow(self, df):
+        """
+        Converte o DataFrame em uma tabela PyArrow com os tipos da tabela SQL.
+        
+        Cada coluna é convertida para o tipo PyArrow equivalente ao tipo SQL
+        definido em get_columns_schema. Colunas sem nenhum valor viram
+        colunas nulas do tipo esperado.
+        """
+        table = pa.Table.from_pandas(df, preserve_index = False)
+        arrays = []
+        for (col, sql_type), array in zip(self.get_columns_schema(df), table.columns):
+            arrow_type = SQL_TO_ARROW_TYPE.get(sql_type, pa.string())
+            if array.null_count == len(array):
+                arrays.append(pa.nulls(len(array), arrow_type))
+            else:
+                arrays.append(array.cast(arrow_type))
+        
+        return pa.table(arrays, names = list(df.columns))
+    
+    def copy_dataframe_binary(self, cursor, df, table_name, buffer = None):
+        """
+        Insere os dados do DataFrame na tabela via COPY FROM STDIN em formato binário.
+        
+        Os valores são codificados direto das colunas PyArrow para o formato
+        binário do PostgreSQL (via pgpq), sem conversão para texto no cliente
+        nem parse de texto no servidor. Um `buffer` binário pode ser
+        informado para ser reaproveitado entre chamadas.
+        """
+        table = self.dataframe_to_arrow(df)
+        encoder = pgpq.ArrowToPostgresBinaryEncoder(table.schema)
+        
+        if buffer is None:
+            buffer = BytesIO()
+        buffer.seek(0)
+        buffer.truncate()
+        buffer.write(encoder.write_header())
+        for batch in table.to_batches():
+            buffer.write(encoder.write_batch(batch))
+        buffer.write(encoder.finish())
+        buffer.seek(0)
+        
+        copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT BINARY)").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, df.columns))
+        )
+        cursor.copy_expert(copy_query, buffer)
+    
+    @staticmethod
+    def new_buffer(method):
+        """
+        Cria o buffer em memória usado pelo método de carga (texto ou binário).
+        """
+        return BytesIO() if method == 'binary' else StringIO()
+    
+    def insert_dataframe(self, cursor, df, table_name, page_size = 10_000):
+        """
+        Insere os dados do DataFrame na tabela com INSERTs de múltiplas linhas.
+        
+        Alternativa ao COPY para quando ele não pode ser usado (ex.: regras
+        ou gatilhos na tabela). O execute_values envia até `page_size` linhas
+        por comando, em vez de uma ida ao servidor por linha, e consome as
+        tuplas aos poucos: só um lote fica montado em memória por vez.
+        """
+        insert_query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, df.columns))
+        )
+        execute_values(cursor, insert_query, self.dataframe_to_records(df, page_size),
+                       page_size = page_size)
+    
+    def load_chunk(self, cursor, chunk, table_name, method, buffer = None):
+        """
+        Insere um bloco de dados usando o método escolhido ('copy', 'binary' ou 'insert').
+        """
+        if method == 'copy':
+            self.copy_dataframe(cursor, chunk, table_name, buffer)
+        elif method == 'binary':
+            self.copy_dataframe_binary(cursor, chunk, table_name, buffer)
+        else:
+            self.insert_dataframe(cursor, chunk, table_name)
+        return len(chunk)
+    
+    def copy_file_server_side(self, cursor, csv_path, table_name, columns,
+                              delimiter, encoding):
+        """
+        Carrega o arquivo CSV pelo servidor com COPY FROM 'arquivo'.
+        
+        O arquivo é lido direto pelo PostgreSQL, sem passar pelo pandas nem
+        pela conexão. Exige que o servidor acesse o caminho do arquivo e tenha
+        permissão de leitura (superusuário ou pg_read_server_files). Em caso
+        de falha, desfaz apenas esta etapa e retorna None.
+        """
+        copy_query = sql.SQL(
+            "COPY {} ({}) FROM %s WITH (FORMAT CSV, HEADER, DELIMITER %s, ENCODING %s)"
+        ).format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+        
+        # O savepoint permite seguir com a transação se o COPY falhar
+        cursor.execute("SAVEPOINT server_side_copy;")
+        try:
+            cursor.execute(copy_query, [os.path.abspath(csv_path), delimiter, encoding])
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT server_side_copy;")
+            print(f"COPY pelo servidor indisponível ({str(e).strip().splitlines()[0]}). "
+                  "Enviando dados pelo cliente.")
+            return None
+        
+        cursor.execute("RELEASE SAVEPOINT server_side_copy;")
+        return cursor.rowcount
     
     def create_table_from_csv(self, csv_path, table_name, db_name, 
-                          delimiter=',', encoding = 'utf-8'):
+                          delimiter=',', encoding = 'utf-8', method = 'copy',
+                          chunksize = 100_000, mode = 'replace',
+                          server_side_copy = False):
         """
         Cria tabela e importa dados de um arquivo CSV.
         
         Esta é a função principal que lê o CSV, cria a tabela com schema
-        apropriado e insere todos os dados no banco.
+        apropriado e insere todos os dados no banco. O parâmetro `method`
+        define a forma de inserção: 'copy' (padrão), 'binary' (COPY em formato
+        binário, requer o pacote pgpq) ou 'insert'. O arquivo é lido e
+        enviado em blocos de `chunksize` linhas.
+        
+        O parâmetro `mode` define o que fazer com uma tabela existente:
+        'replace' (padrão) recria a tabela; 'truncate' esvazia a tabela e
+        mantém sua estrutura; 'append' acrescenta os dados. Nos dois últimos
+        o schema existente precisa ser igual ao derivado do CSV; caso
+        contrário, 'truncate' recria a tabela e 'append' aborta a importação.
+        
+        Com `server_side_copy`, o próprio servidor lê o arquivo (COPY FROM
+        'arquivo'), o que exige que ele enxergue o mesmo caminho. O primeiro
+        bloco ainda é lido pelo pandas para definir o schema; se o COPY no
+        servidor falhar, os dados são enviados pelo cliente normalmente.
         """
+        # Valida o método de inserção antes de abrir conexão
+        if method not in ('copy', 'binary', 'insert'):
+            print(f"Método de inserção inválido: {method}. Use 'copy', 'binary' ou 'insert'.")
+            return False
+        
+        if method == 'binary' and pgpq is None:
+            print("O método 'binary' requer o pacote pgpq (pip install pgpq).")
+            return False
+        
+        if mode not in ('replace', 'truncate', 'append'):
+            print(f"Modo inválido: {mode}. Use 'replace', 'truncate' ou 'append'.")
+            return False
+        
         try:
             # Conecta ao banco de dados especificado
             if not self.create_connection(db_name):
                 return False
             
             cursor = self.connection.cursor()
+            self.configure_bulk_load(cursor)
             
-            # ETAPA 1: LER ARQUIVO CSV
+            # ETAPA 1: LER ARQUIVO CSV EM BLOCOS
+            # A leitura em blocos limita o uso de memória ao tamanho de um bloco
+            # e os tipos PyArrow armazenam textos sem um objeto Python por célula.
+            # Campos vazios já viram nulos (NULL no SQL) e 'valor' já é lido
+            # como número, sem conversões posteriores
             print(f"Lendo arquivo CSV: {csv_path}")
-            df = pd.read_csv(csv_path, delimiter=delimiter, encoding=encoding)
-            
-            # ETAPA 2: PRÉ-PROCESSAR DADOS
-            df = self.preprocess_dataframe(df)
+            reader = pd.read_csv(csv_path, delimiter=delimiter, encoding=encoding,
+                                 chunksize = chunksize, dtype_backend = 'pyarrow',
+                                 na_values = [''], keep_default_na = True,
+                                 dtype = {'valor': pd.ArrowDtype(pa.float64())})
             
-            # ETAPA 3: PREPARAR DEFINIÇÃO DE COLUNAS PARA CREATE TABLE
-            columns_def = []
-            for col in df.columns:
-                # Determina tipo SQL apropriado para cada coluna
-                sql_type = self.get_column_type_for_your_table(col, df[col].dtype)
-                columns_def.append(f"{col} {sql_type}")
+            # ETAPA 2: PRÉ-PROCESSAR DADOS DE CADA BLOCO
+            chunks = (self.preprocess_dataframe(chunk) for chunk in reader)
             
-            # REMOVER TABELA EXISTENTE SE HOUVER (EVITA DUPLICATAS)
-            print(f"Verificando tabela existente: {table_name}")
-            cursor.execute(f"DROP TABLE IF EXISTS {table_name} CASCADE;")
-            print(f"Tabela '{table_name}' limpa (se existia)")
+            # ETAPA 3: PREPARAR TABELA A PARTIR DO PRIMEIRO BLOCO
+            first_chunk = next(chunks)
+            columns = list(first_chunk.columns)
+            create_table = True
             
-            # Query CREATE TABLE
-            create_table_query = f"""
-            CREATE TABLE {table_name} (
-                {', '.join(columns_def)}
-            );
-            """
+            if mode != 'replace':
+                # Reaproveita a tabela existente se o schema for o mesmo
+                existing_schema = self.get_existing_table_schema(cursor, table_name)
+                if self.schemas_match(self.get_columns_schema(first_chunk), existing_schema):
+                    create_table = False
+                    if mode == 'truncate':
+                        # TRUNCATE é mais barato que DROP + CREATE e mantém a estrutura
+                        cursor.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY;").format(sql.Identifier(table_name)))
+                        print(f"Tabela '{table_name}' esvaziada (schema mantido).")
+                    else:
+                        print(f"Acrescentando dados à tabela '{table_name}'.")
+                elif existing_schema and mode == 'append':
+                    print(f"Schema da tabela '{table_name}' difere do CSV. Importação cancelada.")
+                    self.connection.rollback()
+                    return False
+                elif existing_schema:
+                    print(f"Schema da tabela '{table_name}' difere do CSV. Recriando tabela.")
             
-            # Executa criação da tabela
-            cursor.execute(create_table_query)
-            print(f"Tabela '{table_name}' criada com sucesso.")
+            if create_table:
+                self.create_table(cursor, first_chunk, table_name)
+            chunks = chain([first_chunk], chunks)
             print(f"Inserindo dados no banco.")
             
-            # ETAPA 4: PREPARAR DADOS PARA INSERÇÃO
-            data_tuples = []
-            for _, row in df.iterrows():
-                values = []
-                for val in row:
-                    if pd.isna(val):
-                        # Valores nulos do pandas -> None (NULL do SQL)
-                        values.append(None)
-                    else:
-                        # Converte para tipo Python nativo apropriado
-                        if isinstance(val, pd.Timestamp):
-                            # Timestamp do pandas -> datetime do Python
-                            values.append(val.to_pydatetime())
-                        elif pd.api.types.is_integer_dtype(type(val)):
-                            # Inteiros do pandas -> int do Python
-                            values.append(int(val))
-                        elif pd.api.types.is_float_dtype(type(val)):
-                            # Floats do pandas -> float do Python
-                            values.append(float(val))
-                        else:
-                            # Outros tipos (strings) -> str do Python
-                            values.append(str(val))
-                data_tuples.append(tuple(values))
-            
-            # ETAPA 5: INSERIR DADOS EM LOTE
-            # Cria string de placeholders para prepared statement
-            placeholders = ', '.join(['%s'] * len(df.columns))
-            columns_str = ', '.join(df.columns)
+            # ETAPA 4: INSERIR DADOS BLOCO A BLOCO (COPY TEXTO/BINÁRIO OU INSERT EM LOTES)
+            # Se o servidor conseguir ler o arquivo direto, os blocos não são enviados
+            total_rows = None
+            if server_side_copy:
+                total_rows = self.copy_file_server_side(cursor, csv_path, table_name,
+                                                        columns, delimiter, encoding)
             
-            # Query INSERT
-            insert_query = f"""
-                INSERT INTO {table_name} ({columns_str}) 
-                VALUES ({placeholders})
-            """
+            if total_rows is not None:
+                print(f"Arquivo carregado pelo servidor com COPY FROM '{csv_path}'.")
+            else:
+                # Buffer reaproveitado entre os blocos nos modos COPY
+                buffer = self.new_buffer(method)
+                total_rows = 0
+                for chunk in chunks:
+                    total_rows += self.load_chunk(cursor, chunk, table_name, method, buffer)
             
-            # Executa inserção em lote
-            cursor.executemany(insert_query, data_tuples)
+            # ETAPA 5: CRIAR CHAVE PRIMÁRIA APÓS A CARGA (APENAS EM TABELA NOVA)
+            # Construir o índice uma única vez sobre os dados já carregados
+            # é mais rápido do que atualizá-lo a cada linha inserida
+            if create_table:
+                if 'id' in columns:
+                    cursor.execute(sql.SQL("ALTER TABLE {} ADD PRIMARY KEY (id);").format(sql.Identifier(table_name)))
+                    print(f"Chave primária criada na tabela '{table_name}'.")
             
             # ETAPA 6: CONFIRMAR TRANSAÇÃO
             self.connection.commit()
-            print(f"✓ {len(data_tuples):,} registros importados com sucesso.")
+            print(f"✓ {total_rows:,} registros importados com sucesso.")
             
-            # Fecha cursor e conexão
+            # Fecha cursor (a conexão continua aberta para reaproveitamento)
             cursor.close()
-            self.connection.close()
             return True
             
         except pd.errors.EmptyDataError:
             print(f"Arquivo CSV está vazio: {csv_path}")
+            if self.connection:
+                self.connection.rollback()  # Reverte em caso de erro
             return False
         except pd.errors.ParserError:
+            # Com a leitura em blocos, o erro pode surgir depois que a tabela
+            # foi recriada e parte dos dados enviada: desfaz tudo
             print(f"Erro ao ler arquivo CSV (formato inválido): {csv_path}")
+            if self.connection:
+                self.connection.rollback()  # Reverte em caso de erro
             return False
         except psycopg2.Error as e:
             print(f"Erro do PostgreSQL: {e}")
@@ -321,7 +651,8 @@ class PostgreSQLImporter:
             return False
     
     def import_csv_automatic(self, csv_path, db_name, table_name = None, 
-                             delimiter = ',', encoding = 'utf-8'):
+                             delimiter = ',', encoding = 'utf-8', method = 'copy',
+                             mode = 'replace', server_side_copy = False):
         """
         Método automático completo para importação de CSV.
         
@@ -352,7 +683,10 @@ class PostgreSQLImporter:
             table_name, 
             db_name, 
             delimiter, 
-            encoding
+            encoding,
+            method,
+            mode = mode,
+            server_side_copy = server_side_copy
         )
 
         # ETAPA 3: RELATÓRIO FINAL
@@ -435,6 +769,9 @@ def main():
         encoding = 'utf-8'  # Codificação
     )
     
+    # Encerra a conexão reaproveitada ao longo da importação
+    importer.close_connection()
+    
     # Resultado final
     if success:
         print("\nImportação finalizada com sucesso!")
@@ -11,11 +11,18 @@ Funcionalidades:
 4. Consolidação em um único arquivo CSV
 """
 
-from io import StringIO 
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from charset_normalizer import from_bytes
+from io import BytesIO, BufferedReader
 from datetime import datetime
 from dotenv import load_dotenv
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow as pa
 import pandas as pd 
 import requests 
+import codecs
 import os 
 import re 
 
@@ -32,6 +39,32 @@ HEADERS = {
 # URL base da API de dados abertos
 BASE_URL = 'https://dados.gov.br/dados/api/publico'
 
+# Número máximo de arquivos baixados e processados ao mesmo tempo
+MAX_DOWNLOADS_PARALELOS = 8
+
+# Quantidade de bytes do início do arquivo usada para detectar a codificação
+TAMANHO_AMOSTRA_CODIFICACAO = 64 * 1024
+
+# Colunas de identificação (não são valores numéricos nem datas)
+COLUNAS_ID = ('GRUPO_ECONOMICO', 'VARIAVEL', 'OPERADORA')
+
+# Nomes de colunas que representam meses (começam com YYYY-MM)
+REGEX_COLUNA_DATA = re.compile(r'\d{4}-\d{2}')
+
+# Expressões do filtro de recursos (sem diferenciar maiúsculas de minúsculas)
+REGEX_SERVICOS = re.compile(r'SCM|SMP|STFC', re.IGNORECASE)      # Serviços relevantes no título
+REGEX_FORMATO_ODS = re.compile(r'ODS', re.IGNORECASE)            # Formato informado pela API
+REGEX_EXTENSOES = re.compile(r'\.(?:ODS|CSV)', re.IGNORECASE)    # Extensão presente no link
+
+# Expressões da limpeza de decimais, mantidas como texto (e não compiladas)
+# para que o pandas as execute direto nas funções de texto do PyArrow
+REGEX_DECIMAL_ZERADO = r'^(\d+)\.0*$|^\.0+$'      # Parte decimal só com zeros
+REGEX_ZEROS_A_DIREITA = r'^(\d*\.\d*[1-9])0+$'    # Zeros à direita da parte decimal
+
+# Expressões da limpeza final da coluna VALOR (já convertida para número em texto)
+REGEX_VALOR_DECIMAL_ZERADO = r'^([^.]*)\.0*(?:\..*)?$'        # Parte decimal só com zeros
+REGEX_VALOR_ZEROS_A_DIREITA = r'^([^.]*\.[^.]*?)0*(?:\..*)?$'  # Zeros à direita da parte decimal
+
 def buscar_dataset_id_dinamicamente():
     """
     Busca o ID do dataset 'Índice de Desempenho no Atendimento' dinamicamente.
@@ -148,13 +181,10 @@ def extrair_urls_relevantes(dados):
         # Corrige possíveis barras invertidas na URL
         link_corrigido = link.replace('\\', '/')
         
-        # Converte título para maiúsculas para comparação case-insensitive
-        titulo_upper = titulo.upper()
-        
         # Filtra apenas serviços SCM, SMP e STFC
-        if any(servico in titulo_upper for servico in ['SCM', 'SMP', 'STFC']):
+        if REGEX_SERVICOS.search(titulo):
             # Aceita apenas arquivos ODS ou CSV
-            if 'ODS' in formato.upper() or '.ODS' in link_corrigido.upper() or '.CSV' in link_corrigido.upper():
+            if REGEX_FORMATO_ODS.search(formato) or REGEX_EXTENSOES.search(link_corrigido):
                 # Identifica tipo de serviço e extrai ano do título
                 servico = identificar_servico(titulo)
                 
@@ -207,13 +237,15 @@ def encontrar_linha_inicio_dados(df):
     que geralmente é o cabeçalho dos dados.
     """
 
-    # Percorre todas as linhas do DataFrame
-    for idx, linha in df.iterrows():
-        # Concatena todos os valores da linha em uma string
-        linha_str = ' '.join(str(val) for val in linha.values if pd.notna(val))
-        # Verifica se a linha contém o marcador de cabeçalho
-        if 'GRUPO ECONÔMICO' in linha_str.upper() or 'GRUPO_ECON' in linha_str.upper():
-            return idx
+    # Marca, coluna a coluna, as células que contêm o marcador de cabeçalho
+    # (busca vetorizada, sem percorrer as linhas uma a uma)
+    contem_marcador = df.apply(
+        lambda coluna: coluna.str.contains('GRUPO ECONÔMICO|GRUPO_ECON', case = False, na = False)
+    ).any(axis = 1)
+    
+    # Retorna a primeira linha com o marcador
+    if contem_marcador.any():
+        return contem_marcador.idxmax()
     # Se não encontrar, assume que dados começam na primeira linha
     return 0
 
@@ -242,13 +274,19 @@ def extrair_dados_reais(df, url_info):
             'ÍNDICE DE DESEMPENHO NO ATENDIMENTO', 'ANATEL'
         ]
         
-        # Remove linhas que contenham textos de metadados
-        for col in dados_reais.columns:
+        # Junta os padrões em uma única expressão (texto literal, sem diferenciar maiúsculas)
+        regex_metadados = '|'.join(map(re.escape, padroes_metadados))
+        
+        # Marca, em uma passada por coluna, as linhas com textos de metadados
+        contem_metadados = pd.Series(False, index = dados_reais.index)
+        for posicao, col in enumerate(dados_reais.columns):
             if col and isinstance(col, str):
-                for padrao in padroes_metadados:
-                    dados_reais = dados_reais[
-                        ~dados_reais[col].astype(str).str.contains(padrao, case = False, na = False)
-                    ]
+                contem_metadados |= dados_reais.iloc[:, posicao].str.contains(
+                    regex_metadados, case = False, na = False
+                )
+        
+        # Remove as linhas marcadas de uma só vez
+        dados_reais = dados_reais[~contem_metadados]
         
         # Remove linhas totalmente vazias
         return dados_reais.dropna(how = 'all')
@@ -261,19 +299,13 @@ def processar_arquivo_ods(conteudo, url_info):
     Processa arquivo no formato ODS (OpenDocument Spreadsheet).
     """
 
-    # Cria nome de arquivo temporário baseado no hash do título
-    temp_file = f'temp_{hash(url_info["titulo"])}.ods'
-    
     try:
-        # Salva conteúdo binário em um arquivo temporário
-        with open(temp_file, 'wb') as f:
-            f.write(conteudo)
-        
-        # Lê arquivo ODS sem cabeçalho (engine 'odf' para formato OpenDocument)
-        df = pd.read_excel(temp_file, engine = 'odf', header = None, dtype = str)
-        
-        # Remove arquivo temporário após leitura
-        os.remove(temp_file)
+        # Lê arquivo ODS sem cabeçalho direto da memória, sem arquivo temporário
+        # (engine 'calamine', em Rust; 'odf' se o pacote python-calamine faltar)
+        try:
+            df = pd.read_excel(BytesIO(conteudo), engine = 'calamine', header = None, dtype = str)
+        except ImportError:
+            df = pd.read_excel(BytesIO(conteudo), engine = 'odf', header = None, dtype = str)
         
         # Extrai apenas os dados reais
         df = extrair_dados_reais(df, url_info)
@@ -290,37 +322,73 @@ def processar_arquivo_ods(conteudo, url_info):
                 df.columns[1]: 'VARIAVEL'
             })
 
-        # Aplica limpezas e transformações
-        df = limpar_valores_decimais(df)
+        # Normaliza nomes de colunas de data e classifica as colunas uma única vez
         df = normalizar_colunas_data(df)
+        colunas_id, colunas_data = classificar_colunas(df)
+        
+        # Aplica limpezas e transformações
+        df = limpar_valores_decimais(df, colunas_id, colunas_data)
         
         # Converte para formato longo
-        return transformar_para_formato_longo(df, url_info)
+        return transformar_para_formato_longo(df, url_info, colunas_id, colunas_data)
         
     except Exception as e:
         print(f'Erro ao processar ODS: {e}')
-        # Remove arquivo temporário se ainda existir
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
         return None
 
 
-def processar_arquivo_csv(conteudo, url_info):
+def detectar_codificacao(conteudo):
+    """
+    Detecta a codificação de um arquivo a partir de uma amostra do seu início.
+    
+    Verifica primeiro os casos simples (BOM, ASCII e UTF-8 válido); só se
+    nenhum se aplicar usa o charset_normalizer, restrito às codificações
+    ocidentais usadas nos arquivos da Anatel.
+    """
+    amostra = conteudo[:TAMANHO_AMOSTRA_CODIFICACAO]
+    
+    # Marca de ordem de bytes (BOM) do UTF-8
+    if amostra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    
+    # Texto só com ASCII é UTF-8 válido
+    if amostra.isascii():
+        return 'utf-8'
+    
+    try:
+        # Decodificador incremental tolera um caractere cortado no fim da amostra
+        codecs.getincrementaldecoder('utf-8')().decode(amostra)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Caso ambíguo: escolhe entre latin-1 e cp1252 pela análise da amostra
+    resultado = from_bytes(amostra, cp_isolation = ['latin_1', 'cp1252']).best()
+    return resultado.encoding if resultado is not None else 'latin-1'
+
+
+def processar_arquivo_csv(arquivo, url_info, encoding = None):
     """
     Processa arquivo no formato CSV.
+    
+    Recebe um fluxo binário (ex.: o corpo da resposta HTTP), lido pelo
+    parser à medida que os dados chegam. Sem `encoding`, a codificação é
+    detectada por uma amostra do início; como a decodificação é estrita,
+    um UnicodeDecodeError é repassado para que o arquivo seja relido.
     """
 
     try:
-        # Tenta diferentes codificações
-        for encoding in ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']:
-            try:
-                # Decodifica conteúdo binário para string
-                conteudo_str = conteudo.decode(encoding)
-                # Lê CSV com separador de tabulação
-                df = pd.read_csv(StringIO(conteudo_str), header = None, sep = '\t', dtype = str)
-                break  # Sai do loop se conseguir ler
-            except:
-                continue  # Tenta a próxima codificação
+        # Bufferiza o fluxo para espiar o início sem consumi-lo
+        arquivo = BufferedReader(arquivo, buffer_size = TAMANHO_AMOSTRA_CODIFICACAO)
+        
+        # Detecta a codificação uma única vez, por uma amostra
+        if encoding is None:
+            encoding = detectar_codificacao(arquivo.peek(TAMANHO_AMOSTRA_CODIFICACAO))
+        
+        # Lê CSV com separador de tabulação, decodificando direto no parser C
+        # (low_memory=False lê o arquivo de uma vez, sem blocos internos)
+        df = pd.read_csv(arquivo, header = None, sep = '\t', dtype = str,
+                         encoding = encoding, engine = 'c', low_memory = False)
         
         # Extrai dados reais
         df = extrair_dados_reais(df, url_info)
@@ -332,69 +400,134 @@ def processar_arquivo_csv(conteudo, url_info):
                 df.columns[1]: 'VARIAVEL'
             })
         
-        # Aplica limpezas e transformações
-        df = limpar_valores_decimais(df)
+        # Normaliza nomes de colunas de data e classifica as colunas uma única vez
         df = normalizar_colunas_data(df)
+        colunas_id, colunas_data = classificar_colunas(df)
+        
+        # Aplica limpezas e transformações
+        df = limpar_valores_decimais(df, colunas_id, colunas_data)
         
         # Converte para formato longo
-        return transformar_para_formato_longo(df, url_info)
+        return transformar_para_formato_longo(df, url_info, colunas_id, colunas_data)
+    
+    except UnicodeDecodeError:
+        # A amostra não representava o arquivo todo: quem chamou relê o arquivo
+        raise
         
     except Exception as e:
         print(f'Erro ao processar CSV: {e}')
         return None
 
 
-def baixar_arquivo(url_info):
+def processar_csv_em_fluxo(url_info, sessao = None, encoding = None):
+    """
+    Baixa um CSV e o processa direto do fluxo da resposta, enquanto chega.
+    """
+    response = baixar_arquivo(url_info, sessao, stream = True)
+    if response is None:
+        return None
+    with response:
+        # Descompacta o corpo se o servidor o enviou com gzip/deflate e mantém
+        # o fluxo aberto ao fim dos dados (exigido pelo BufferedReader)
+        response.raw.decode_content = True
+        response.raw.auto_close = False
+        return processar_arquivo_csv(response.raw, url_info, encoding)
+
+
+def baixar_arquivo(url_info, sessao = None, stream = False):
     """
     Baixa o conteúdo de um arquivo a partir da URL.
+    
+    Se uma `sessao` for informada, suas conexões são reaproveitadas
+    entre os downloads. Com `stream`, retorna a resposta ainda aberta,
+    para que o corpo seja lido aos poucos (quem chama deve fechá-la).
     """
     print(f'Baixando: {url_info["titulo"]}')
     
+    # Usa a sessão compartilhada, se houver
+    cliente = sessao if sessao is not None else requests
+    
     try:
         # Primeira tentativa com headers de autenticação
-        response = requests.get(url_info['url'], headers = HEADERS, timeout = 20)
+        response = cliente.get(url_info['url'], headers = HEADERS, timeout = 20, stream = stream)
         
         # Se falhar com autenticação, tenta sem (alguns arquivos são públicos)
         if response.status_code != 200:
-            response = requests.get(url_info['url'], timeout = 20)
+            response.close()
+            response = cliente.get(url_info['url'], timeout = 20, stream = stream)
         
-        # Verifica se requisição foi bem-sucedida
-        response.raise_for_status()
+        # Verifica se requisição foi bem-sucedida (em caso de erro, fecha a
+        # resposta aberta para devolver a conexão ao pool da sessão)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
         
-        # Retorna conteúdo binário
-        return response.content
+        # Retorna a resposta aberta ou o conteúdo binário completo
+        return response if stream else response.content
         
     except Exception as e:
         print(f'Erro ao baixar: {e}')
         return None
 
 
-def processar_arquivo_individual(url_info):
+def processar_arquivo_individual(url_info, sessao = None):
     """
     Processa um arquivo individual (rota para ODS ou CSV).
     """
 
     print(f'\nProcessando: {url_info["titulo"]}')
     
-    # Baixa conteúdo do arquivo
-    conteudo = baixar_arquivo(url_info)
-    if conteudo is None:
-        return None
-    
     # Normaliza URL e formato para comparação case-insensitive
     url = url_info['url'].upper()
     formato = url_info.get('formato', '').upper()
     
     # Escolhe processador baseado no formato do arquivo
     if '.ODS' in url or 'ODS' in formato:
+        # O ODS é um arquivo compactado: precisa do conteúdo completo
+        conteudo = baixar_arquivo(url_info, sessao)
+        if conteudo is None:
+            return None
         return processar_arquivo_ods(conteudo, url_info)
     elif '.CSV' in url or 'CSV' in formato:
-        return processar_arquivo_csv(conteudo, url_info)
+        # O CSV é lido pelo parser direto do fluxo da resposta, enquanto chega
+        try:
+            return processar_csv_em_fluxo(url_info, sessao)
+        except UnicodeDecodeError as e:
+            # O fluxo já foi consumido: baixa de novo e lê como latin-1, que
+            # decodifica qualquer sequência de bytes (como o laço original)
+            print(f'Codificação detectada inválida ({e.encoding}), relendo como latin-1')
+            return processar_csv_em_fluxo(url_info, sessao, encoding = 'latin-1')
     
     # Formato não suportado
     print('Formato não suportado')
     return None
 
+def classificar_colunas(df):
+    """
+    Classifica as colunas em colunas de identificação e colunas de data.
+    
+    Retorna duas listas, na ordem das colunas do DataFrame: as colunas
+    de identificação e as colunas de data (formato YYYY-MM).
+    """
+    colunas_id = []  # Colunas de identificação
+    colunas_data = []  # Colunas que representam datas/meses
+    
+    # Classifica cada coluna
+    for coluna in df.columns:
+        coluna_str = str(coluna)
+        
+        # Colunas de identificação
+        if coluna_str in COLUNAS_ID:
+            colunas_id.append(coluna)
+        # Colunas de data (formato YYYY-MM)
+        elif REGEX_COLUNA_DATA.match(coluna_str):
+            colunas_data.append(coluna)
+    
+    return colunas_id, colunas_data
+
+
 def normalizar_colunas_data(df):
     """
     Normaliza colunas de data para formato padrão 'YYYY-MM'.
@@ -402,15 +535,16 @@ def normalizar_colunas_data(df):
     Converte formatos como '2013-01-01 00:00:00' para '2013-01'.
     """
 
-    # Cria cópia para evitar modificar o original
-    df_normalizado = df.copy()
+    # Novos nomes das colunas, aplicados de uma só vez ao final
+    # (sem cópia prévia do DataFrame: os chamadores substituem o original)
+    novos_nomes = {}
     
     # Percorre todas as colunas
     for coluna in df.columns:
         coluna_str = str(coluna)
         
         # Ignora colunas já no formato YYYY-MM
-        if re.match(r'\d{4}-\d{2}', coluna_str):
+        if REGEX_COLUNA_DATA.match(coluna_str):
             continue
         
         # Trata colunas com timestamp completo
@@ -420,87 +554,67 @@ def normalizar_colunas_data(df):
                 data_obj = datetime.strptime(coluna_str, '%Y-%m-%d %H:%M:%S')
                 # Formata para YYYY-MM
                 nome_normalizado = data_obj.strftime('%Y-%m')
-                # Renomeia a coluna
-                df_normalizado = df_normalizado.rename(columns={coluna: nome_normalizado})
+                # Registra o novo nome da coluna
+                novos_nomes[coluna] = nome_normalizado
             except:
                 continue  # Se falhar, mantém coluna original
     
-    return df_normalizado
+    # Renomeia as colunas (com Copy-on-Write, os dados não são copiados)
+    return df.rename(columns = novos_nomes) if novos_nomes else df
 
 
-def limpar_valores_decimais(df):
+def limpar_valores_decimais(df, colunas_id = None, colunas_data = None):
     """
     Remove zeros decimais desnecessários de valores numéricos.
     
     Exemplo: '15.00' -> '15', '15.50' -> '15.5'
+    
+    As colunas de identificação e de data são ignoradas; se não forem
+    informadas, são obtidas com classificar_colunas.
     """
-    # Cria cópia para evitar modificar o original
-    df_limpo = df.copy()
+    # Altera o próprio DataFrame, sem cópia prévia
+    # (os chamadores substituem o original pelo resultado)
+    df_limpo = df
+    
+    if colunas_id is None or colunas_data is None:
+        colunas_id, colunas_data = classificar_colunas(df_limpo)
+    colunas_ignoradas = set(colunas_id) | set(colunas_data)
     
     # Percorre todas as colunas
     for coluna in df_limpo.columns:
-        # Ignora colunas de identificação (não são valores numéricos)
-        if coluna in ['GRUPO_ECONOMICO', 'VARIAVEL', 'OPERADORA']:
-            continue
-        # Ignora colunas que representam datas
-        if re.match(r'\d{4}-\d{2}', str(coluna)):
+        # Ignora colunas de identificação e de datas (não são valores numéricos)
+        if coluna in colunas_ignoradas:
             continue
         
-        # Função interna para limpar cada valor individualmente
-        def limpar_celula(valor):
-            if pd.isna(valor):
-                return valor  # Mantém valores nulos
-            
-            valor_str = str(valor).strip()
-            
-            # Verifica se é número com parte decimal
-            if '.' in valor_str and valor_str.replace('.', '').isdigit():
-                partes = valor_str.split('.')
-                if len(partes) == 2:
-                    parte_inteira = partes[0]
-                    parte_decimal = partes[1]
-                    
-                    # Remove decimais que são apenas zeros
-                    if parte_decimal.replace('0', '') == '':
-                        return parte_inteira  # Ex: '15.00' -> '15'
-                    else:
-                        # Remove zeros à direita da parte decimal
-                        parte_decimal_limpa = parte_decimal.rstrip('0')
-                        if parte_decimal_limpa:
-                            return f'{parte_inteira}.{parte_decimal_limpa}'  # Ex: '15.50' -> '15.5'
-                        else:
-                            return parte_inteira  # Ex: '15.0' -> '15'
-            
-            return valor_str  # Retorna valor original se não for número decimal
-        
-        # Aplica limpeza a toda a coluna
-        df_limpo[coluna] = df_limpo[coluna].apply(limpar_celula)
+        # Remove espaços e zeros decimais desnecessários da coluna inteira
+        # (duas substituições vetorizadas em vez de uma função por célula)
+        df_limpo[coluna] = (
+            df_limpo[coluna].str.strip()
+            .str.replace(REGEX_DECIMAL_ZERADO, r'\1', regex = True)  # Ex: '15.00' -> '15'
+            .str.replace(REGEX_ZEROS_A_DIREITA, r'\1', regex = True)  # Ex: '15.50' -> '15.5'
+        )
     
     return df_limpo
 
 
-def transformar_para_formato_longo(df, url_info):
+def transformar_para_formato_longo(df, url_info, colunas_id = None, colunas_data = None, parse_dates = False):
     """
     Transforma DataFrame de formato largo para formato longo.
     
     Formato largo: Colunas representam meses, linhas representam variáveis
     Formato longo: Cada linha tem uma observação (variável + mês + valor)
+    
+    Se as colunas de identificação e de data não forem informadas, são
+    obtidas com classificar_colunas.
+    
+    Com parse_dates = True a referência de mês vira datetime; por padrão fica
+    como texto YYYY-MM-01, pronto para o CSV e aceito pela coluna DATE do
+    PostgreSQL, sem criar e depois reformatar uma coluna datetime inteira.
     """
 
-    # Listas para classificar colunas
-    colunas_id = []  # Colunas de identificação
-    colunas_data = []  # Colunas que representam datas/meses
-    
-    # Classifica cada coluna
-    for coluna in df.columns:
-        coluna_str = str(coluna)
-        
-        # Colunas de identificação
-        if coluna_str in ['GRUPO_ECONOMICO', 'VARIAVEL', 'OPERADORA']:
-            colunas_id.append(coluna)
-        # Colunas de data (formato YYYY-MM)
-        elif re.match(r'\d{4}-\d{2}', coluna_str):
-            colunas_data.append(coluna)
+    # Classifica as colunas, se ainda não classificadas
+    if colunas_id is None or colunas_data is None:
+        colunas_id, colunas_data = classificar_colunas(df)
     
     # Se não houver colunas suficientes, mantém formato original
     if not colunas_id or not colunas_data:
@@ -518,68 +632,49 @@ def transformar_para_formato_longo(df, url_info):
         )
         
         # Converte referência de mês para datetime
-        df_longo['REFERENCIA_MES'] = pd.to_datetime(
-            df_longo['REFERENCIA_MES'],
+        # O melt empilha as colunas de data em blocos, uma após a outra, então
+        # cada nome de coluna é convertido uma única vez e repetido no seu bloco
+        datas = pd.to_datetime(
+            pd.Index(colunas_data),
             format='%Y-%m',
             errors='coerce'  # Converte erros para NaT
         )
+        if not parse_dates:
+            # Mantém como texto (meses inválidos ficam vazios)
+            datas = datas.strftime('%Y-%m-%d')
+        df_longo['REFERENCIA_MES'] = datas.repeat(len(df))
         
         # Adiciona coluna com tipo de serviço
         df_longo['SERVICO'] = url_info['servico']
         
-        # Função para converter valores para formato numérico padronizado
-        def converter_para_numero(valor):
-            if pd.isna(valor):
-                return ''  # Retorna string vazia para nulos
-            
-            valor_str = str(valor).strip()
-            
-            # Valores inválidos comuns
-            valores_invalidos = ['', 'nan', 'NaN', '-', '--', '---', 'ND', 'N/D']
-            if valor_str in valores_invalidos:
-                return ''
-            
-            # Remove caracteres não numéricos
-            valor_limpo = re.sub(r'[^\d\.,]', '', valor_str)
-            
-            if not valor_limpo:
-                return ''
-            
-            try:
-                # Trata formato brasileiro (1.234,56 -> 1234.56)
-                if ',' in valor_limpo:
-                    if '.' in valor_limpo:
-                        # Formato com separador de milhar e decimal: 1.234,56
-                        partes_virgula = valor_limpo.split(',')
-                        parte_inteira = partes_virgula[0].replace('.', '')  # Remove pontos
-                        if len(partes_virgula) > 1:
-                            parte_decimal = partes_virgula[1]
-                            return f'{parte_inteira}.{parte_decimal}'
-                        else:
-                            return parte_inteira
-                    else:
-                        # Formato com vírgula decimal: 1234,56 -> 1234.56
-                        return valor_limpo.replace(',', '.')
-                
-                # Trata números com ponto decimal
-                elif '.' in valor_limpo:
-                    partes = valor_limpo.split('.')
-                    if len(partes) > 2:
-                        # Múltiplos pontos = separador de milhar: 1.234.56 -> 123456
-                        return ''.join(partes)
-                    else:
-                        # Ponto decimal normal
-                        return valor_limpo
-                else:
-                    # Número inteiro
-                    return valor_limpo
-                    
-            except Exception:
-                # Se houver erro, retorna valor original
-                return valor_str
-        
-        # Aplica conversão a todos os valores
-        df_longo['VALOR'] = df_longo['VALOR'].apply(converter_para_numero)
+        # Converte valores para formato numérico padronizado, coluna inteira de uma vez
+        # Remove espaços e caracteres não numéricos (valores inválidos como
+        # '-', 'ND' e 'N/D' ficam vazios, pois não têm dígitos, ponto ou vírgula)
+        valores = df_longo['VALOR'].str.strip().str.replace(r'[^\d.,]', '', regex = True)
+        tem_virgula = valores.str.contains(',', regex = False, na = False)
+        tem_ponto = valores.str.contains('.', regex = False, na = False)
+        
+        # Cada formato é tratado apenas nas linhas em que aparece; demais
+        # casos (inteiros e ponto decimal normal) mantêm o valor limpo
+        
+        # Formato com separador de milhar e decimal: 1.234,56 -> 1234.56
+        # (parte inteira antes da primeira vírgula; decimal até a vírgula seguinte)
+        milhar_decimal = tem_virgula & tem_ponto
+        selecao = valores[milhar_decimal]
+        parte_inteira = selecao.str.replace(r'^([^,]*),.*$', r'\1', regex = True).str.replace('.', '', regex = False)
+        parte_decimal = selecao.str.replace(r'^[^,]*,([^,]*).*$', r'\1', regex = True)
+        valores[milhar_decimal] = parte_inteira + '.' + parte_decimal
+        
+        # Formato com vírgula decimal: 1234,56 -> 1234.56
+        virgula_decimal = tem_virgula & ~tem_ponto
+        valores[virgula_decimal] = valores[virgula_decimal].str.replace(',', '.', regex = False)
+        
+        # Múltiplos pontos = separador de milhar: 1.234.56 -> 123456
+        multiplos_pontos = ~tem_virgula & (valores.str.count(r'\.') > 1)
+        valores[multiplos_pontos] = valores[multiplos_pontos].str.replace('.', '', regex = False)
+        
+        # Valores nulos viram string vazia
+        df_longo['VALOR'] = valores.fillna('')
         
         return df_longo
         
@@ -623,51 +718,48 @@ def criar_dataframe_consolidado():
         if not urls:
             raise Exception('Nenhum arquivo relevante encontrado')
 
-        # ETAPA 4: PROCESSAR CADA ARQUIVO
+        # ETAPA 4: PROCESSAR OS ARQUIVOS EM PARALELO
+        # Os downloads são limitados pela rede, então vários arquivos são
+        # baixados ao mesmo tempo, reaproveitando conexões de uma única sessão
         dataframes = []
         print(f'\nProcessando {len(urls)} arquivos...')
         
-        for i, url_info in enumerate(urls, 1):
-            print(f'\n[{i}/{len(urls)}]', end='')
-            df = processar_arquivo_individual(url_info)
+        sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections = MAX_DOWNLOADS_PARALELOS,
+                                pool_maxsize = MAX_DOWNLOADS_PARALELOS)
+        sessao.mount('https://', adaptador)
+        sessao.mount('http://', adaptador)
+        
+        with sessao, ThreadPoolExecutor(max_workers = min(MAX_DOWNLOADS_PARALELOS, len(urls))) as executor:
+            # map devolve os resultados na ordem original das URLs
+            resultados = executor.map(lambda url_info: processar_arquivo_individual(url_info, sessao), urls)
             
-            # Adiciona apenas DataFrames válidos e não vazios
-            if df is not None and len(df) > 0:
-                dataframes.append(df)
-                print('Baixado com sucesso')
+            for i, (url_info, df) in enumerate(zip(urls, resultados), 1):
+                # Adiciona apenas DataFrames válidos e não vazios, já sem
+                # duplicatas internas (feito enquanto os demais são baixados)
+                if df is not None and len(df) > 0:
+                    dataframes.append(df.drop_duplicates())
+                    print(f'\n[{i}/{len(urls)}] Baixado com sucesso: {url_info["titulo"]}')
         
         # Verifica se algum arquivo foi processado com sucesso
         if not dataframes:
             raise Exception('Nenhum dado pôde ser processado')
         
         # ETAPA 5: CONSOLIDAR TODOS OS DATAFRAMES
-        df_consolidado = pd.concat(dataframes, ignore_index = True)
+        df_consolidado = pd.concat(dataframes, ignore_index = True, sort = False)
         
-        # Remove duplicatas exatas
+        # Remove duplicatas exatas entre arquivos diferentes
         df_consolidado = df_consolidado.drop_duplicates()
         
         # ETAPA 6: LIMPEZA FINAL DE VALORES
+        # Remove zeros decimais desnecessários com duas substituições vetorizadas
+        # (só a parte entre o primeiro e um eventual segundo ponto é considerada)
         if 'VALOR' in df_consolidado.columns:
-            def limpar_valor_final(valor):
-                if pd.isna(valor) or valor == '':
-                    return ''
-                
-                valor_str = str(valor)
-                
-                # Remove zeros decimais desnecessários
-                if '.' in valor_str:
-                    partes = valor_str.split('.')
-                    parte_inteira = partes[0]
-                    parte_decimal = partes[1].rstrip('0')  # Remove zeros à direita
-                    
-                    if parte_decimal:
-                        return f'{parte_inteira}.{parte_decimal}'
-                    else:
-                        return parte_inteira
-                
-                return valor_str
-            
-            df_consolidado['VALOR'] = df_consolidado['VALOR'].apply(limpar_valor_final)
+            df_consolidado['VALOR'] = (
+                df_consolidado['VALOR'].fillna('')
+                .str.replace(REGEX_VALOR_DECIMAL_ZERADO, r'\1', regex = True)   # Ex: '15.00' -> '15'
+                .str.replace(REGEX_VALOR_ZEROS_A_DIREITA, r'\1', regex = True)  # Ex: '15.50' -> '15.5'
+            )
         
         # ETAPA 7: RENOMEAR COLUNAS PARA PADRÃO FINAL
         renomear_colunas = {}
@@ -714,6 +806,33 @@ def criar_dataframe_consolidado():
         print(f'\nErro na Coleta: {e}')
         raise
 
+def salvar_csv(df, nome_arquivo):
+    """
+    Salva o DataFrame em CSV (UTF-8) com o escritor em C++ do PyArrow.
+    
+    Datas sem horário são gravadas como YYYY-MM-DD e textos vazios como
+    campos vazios, como no to_csv do pandas. O PyArrow coloca os textos
+    entre aspas, o que não muda a leitura pelo pandas nem pelo COPY.
+    """
+    tabela = pa.Table.from_pandas(df, preserve_index = False)
+    
+    colunas = []
+    for coluna in tabela.columns:
+        if pa.types.is_timestamp(coluna.type):
+            try:
+                # Grava só a data (falha se algum valor tiver horário)
+                coluna = coluna.cast(pa.date32())
+            except pa.ArrowInvalid:
+                pass
+        elif pa.types.is_string(coluna.type) or pa.types.is_large_string(coluna.type):
+            # Texto vazio vira nulo, gravado como campo vazio (e não "")
+            coluna = pc.if_else(pc.equal(coluna, ''), pa.scalar(None, coluna.type), coluna)
+        colunas.append(coluna)
+    
+    # Textos entre aspas; números e nulos sem aspas
+    pacsv.write_csv(pa.table(colunas, names = tabela.column_names), nome_arquivo,
+                    pacsv.WriteOptions(quoting_style = 'needed'))
+
 # FUNÇÃO MAIN
 
 def main():
@@ -739,7 +858,7 @@ def main():
             nome_arquivo = f'dados_ida_tratados.csv'
             
             # Salva DataFrame em CSV com codificação UTF-8
-            df_final.to_csv(nome_arquivo, index=False, encoding='utf-8')
+            salvar_csv(df_final, nome_arquivo)
             
             print(f'\nDados salvos em: {nome_arquivo}')
             